@@ -1,5 +1,6 @@
 __all__ = [
     "espn_service",
+    "models",
     "tools",
     "server",
 ]
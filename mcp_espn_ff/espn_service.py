@@ -1,22 +1,308 @@
 import sys
 import os
 import asyncio
+import datetime
+import hashlib
+import pickle
+import shutil
+import tempfile
 import time
-from dataclasses import dataclass
-from typing import Optional, Tuple, Literal
-from espn_api.football import League
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
+from http.cookiejar import DefaultCookiePolicy
+from typing import Callable, Optional, Tuple, Literal
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from espn_api.football import League, Player, Team
+from espn_api.requests import espn_requests
 
 
 def log_error(message: str) -> None:
     print(message, file=sys.stderr)
 
 
+def _today() -> int:
+    # Local calendar day, so the cached season flips at local midnight like the month check below
+    return datetime.date.today().toordinal()
+
+
+@lru_cache(maxsize=1)
+def _current_season(day: int) -> int:
+    # Keyed by day so a long-running server rolls over to the new season
+    today = datetime.date.fromordinal(day)
+    return today.year - 1 if today.month < 7 else today.year
+
+
+def current_season() -> int:
+    return _current_season(_today())
+
+
+class _PooledRequests:
+    """Stands in for the ``requests`` module inside espn_api so its calls share one Session.
+
+    espn_api calls ``requests.get`` directly, opening a new TLS connection per request.
+    Routing those calls through a shared Session keeps connections alive across tool calls
+    and adds retries on transient ESPN errors.
+    """
+
+    def __init__(self, timeout: float = 30.0) -> None:
+        # Retry 5xx only, with short fixed backoff: Retry-After is ignored so a worker (and every
+        # caller coalesced onto its fetch) never sleeps for as long as ESPN asks. The last response
+        # is returned rather than raised, so espn_api still reports the HTTP status itself.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # espn_api passes cookies on every call; don't let response cookies leak between leagues
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self._timeout = timeout
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self._timeout)
+        return self._session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        kwargs.setdefault("timeout", self._timeout)
+        return self._session.post(url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+espn_requests.requests = _PooledRequests()
+
+
+DEFAULT_LEAGUE_TTL_SECONDS = 300.0
+# After a failed background refresh, keep serving the stale entry this long before retrying
+REFRESH_RETRY_SECONDS = 60.0
+ESPN_WORKER_THREADS = 16
+DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcp_espn_ff")
+
+
+def _seconds_from_env(default: float, *names: str) -> float:
+    # First non-empty variable wins, so later names act as aliases
+    raw = next((os.environ[name] for name in names if os.environ.get(name)), None)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        log_error(f"Ignoring invalid {names[0]}={raw!r}; using {default:g}s")
+        return default
+
+
+def env_flag(name: str) -> bool:
+    """True when the environment variable is set to 1, true, yes or on (case-insensitive)."""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class CachedLeague:
+    """A cached League plus lookup tables derived from it, dropped together on expiry."""
+
+    league: League
+    created_at: float
+    players_by_name: Optional[dict[str, Player]] = field(default=None, repr=False)
+    players_by_token: Optional[dict[str, list[Player]]] = field(default=None, repr=False)
+    player_names: Optional[list[Tuple[str, Player]]] = field(default=None, repr=False)
+    sorted_teams: Optional[list[Team]] = field(default=None, repr=False)
+    team_count: int = field(init=False)
+    refresh_failed_at: Optional[float] = field(default=None, repr=False)
+    # Rendered tool responses; they depend only on this entry, so they expire with it
+    responses: dict[Tuple, str] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self.team_count = len(self.league.teams)
+
+    def memoize(self, key: Tuple, build: Callable[[], str]) -> str:
+        response = self.responses.get(key)
+        if response is None:
+            response = build()
+            self.responses[key] = response
+        return response
+
+    def standings(self) -> list[Team]:
+        """Teams ordered by (wins, points_for), best first; computed when the entry is cached."""
+        if self.sorted_teams is None:
+            rows = [(team.wins, team.points_for, team) for team in self.league.teams]
+            rows.sort(key=itemgetter(0, 1), reverse=True)
+            self.sorted_teams = [row[2] for row in rows]
+        return self.sorted_teams
+
+    def _build_player_index(self) -> None:
+        by_name: dict[str, Player] = {}
+        by_token: defaultdict[str, list[Player]] = defaultdict(list)
+        names: list[Tuple[str, Player]] = []
+        for team in self.league.teams:
+            for player in team.roster:
+                lower_name = player.name.lower()
+                by_name.setdefault(lower_name, player)
+                for token in lower_name.split():
+                    by_token[token].append(player)
+                names.append((lower_name, player))
+        self.players_by_name = by_name
+        self.players_by_token = by_token
+        self.player_names = names
+
+    def find_player(self, player_name: str) -> Optional[Player]:
+        """Exact name, then whole words, then substring match (case-insensitive)."""
+        if self.players_by_name is None:
+            self._build_player_index()
+        query = player_name.lower()
+        player = self.players_by_name.get(query)
+        if player is not None:
+            return player
+        # Every query word must be a whole word of the name, in any order
+        tokens = query.split()
+        if tokens:
+            matches = self.players_by_token.get(tokens[0], [])
+            for token in tokens[1:]:
+                if not matches:
+                    break
+                with_token = {id(p) for p in self.players_by_token.get(token, ())}
+                matches = [p for p in matches if id(p) in with_token]
+            if matches:
+                return matches[0]
+        for lower_name, player in self.player_names:
+            if query in lower_name:
+                return player
+        return None
+
+
+def _disk_cache_path(league_id: int, year: int) -> Optional[str]:
+    # Only closed seasons are cached on disk: their data can no longer change
+    if not env_flag("ENABLE_DISK_CACHE"):
+        return None
+    if year >= current_season():
+        return None
+    return os.path.join(DISK_CACHE_DIR, f"{league_id}_{year}.pkl")
+
+
+def _credentials_digest(espn_s2: str, swid: str) -> str:
+    # Stored next to each pickled league so a cache written under other credentials is ignored
+    return hashlib.sha256(f"{espn_s2}\0{swid}".encode("utf-8")).hexdigest()
+
+
+def _read_disk_cache(path: str, digest: str) -> Optional[League]:
+    try:
+        with open(path, "rb") as f:
+            stored = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log_error(f"Ignoring unreadable league cache file {path}: {str(e)}")
+        return None
+    if not isinstance(stored, tuple) or len(stored) != 2 or stored[0] != digest:
+        return None
+    return stored[1]
+
+
+def _write_disk_cache(path: str, digest: str, league: League) -> None:
+    # The pickle holds the ESPN cookies, so keep it private to the user. Writing to a
+    # per-process temp file and renaming keeps concurrent writers from interleaving.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((digest, league), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        log_error(f"Could not write league cache file {path}: {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _fetch_league(
+    league_id: int, year: int, espn_s2: str, swid: str, is_current: Callable[[], bool]
+) -> CachedLeague:
+    # Runs in a worker thread: fetch the league and build its lookup tables in one go.
+    # is_current() turns false once the cache is invalidated, so a stale fetch isn't written back.
+    path = _disk_cache_path(league_id, year)
+    digest = _credentials_digest(espn_s2, swid)
+    league = _read_disk_cache(path, digest) if path else None
+    if league is None:
+        league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
+        if path and is_current():
+            _write_disk_cache(path, digest, league)
+    else:
+        log_error(f"Loaded league {league_id}, year {year} from {path}")
+        # Follow-up requests (e.g. box_scores) should use the current cookies, not the pickled ones
+        if espn_s2 and swid:
+            league.espn_request.cookies = {"espn_s2": espn_s2, "SWID": swid}
+    entry = CachedLeague(league=league, created_at=time.monotonic())
+    entry._build_player_index()
+    entry.standings()
+    return entry
+
+
+def _remove_disk_cache(league_id: Optional[int], year: Optional[int]) -> set[Tuple[int, int]]:
+    # Matches on the parsed file name, so it also clears files written while the cache was enabled
+    removed: set[Tuple[int, int]] = set()
+    try:
+        names = os.listdir(DISK_CACHE_DIR)
+    except OSError:
+        return removed
+    for name in names:
+        stem, ext = os.path.splitext(name)
+        file_league_id, sep, file_year = stem.partition("_")
+        if ext != ".pkl" or not sep or not file_league_id.isdigit() or not file_year.isdigit():
+            continue
+        key = (int(file_league_id), int(file_year))
+        if (league_id is None or key[0] == league_id) and (year is None or key[1] == year):
+            try:
+                os.remove(os.path.join(DISK_CACHE_DIR, name))
+            except OSError as e:
+                log_error(f"Could not remove league cache file {name}: {str(e)}")
+                continue
+            removed.add(key)
+    return removed
+
+
 class LeagueService:
-    def __init__(self) -> None:
-        self._cache: dict[Tuple[int, int], League] = {}
+    def __init__(
+        self,
+        max_leagues: int = 64,
+        ttl_seconds: float | None = None,
+        max_stale_seconds: float | None = None,
+    ) -> None:
+        # LRU ordered: least recently used first, evicted once over max_leagues.
+        # Entries are fresh for ttl_seconds; for max_stale_seconds after that they are still
+        # served while a background refresh runs, and past that they are refetched inline.
+        self._cache: OrderedDict[Tuple[int, int], CachedLeague] = OrderedDict()
+        self._max_leagues = max_leagues
+        if ttl_seconds is None:
+            ttl_seconds = _seconds_from_env(DEFAULT_LEAGUE_TTL_SECONDS, "MCP_LEAGUE_TTL", "LEAGUE_CACHE_TTL")
+        if max_stale_seconds is None:
+            max_stale_seconds = _seconds_from_env(ttl_seconds, "MCP_LEAGUE_MAX_STALE")
+        self._ttl_seconds = ttl_seconds
+        self._hard_ttl_seconds = ttl_seconds + max_stale_seconds
         self._last_creds: Tuple[str, str] | None = None
+        # One in-flight League construction per (key, creds, generation); concurrent callers await the same task
+        self._inflight: dict[Tuple[Tuple[int, int], Tuple[str, str], int], asyncio.Future[CachedLeague]] = {}
+        # In-flight loads some caller awaits; their failures reach that caller instead of the log
+        self._awaited: set[Tuple[Tuple[int, int], Tuple[str, str], int]] = set()
+        # Bumped by invalidate(); loads started before a clear must not repopulate the cache
+        self._generation = 0
 
     async def get_league(self, league_id: int, year: int) -> League:
+        return (await self.get_cached_league(league_id, year)).league
+
+    async def get_cached_league(self, league_id: int, year: int) -> CachedLeague:
         espn_s2, swid, _ = await ensure_authenticated()
 
         # Invalidate cache if credentials changed
@@ -26,11 +312,97 @@ class LeagueService:
         self._last_creds = current_creds
 
         key = (league_id, year)
-        if key not in self._cache:
-            log_error(f"Creating new league instance for {league_id}, year {year}")
-            self._cache[key] = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
-        return self._cache[key]
-
+        entry = self._cache.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.created_at
+            if age <= self._hard_ttl_seconds:
+                self._cache.move_to_end(key)
+                failed_at = entry.refresh_failed_at
+                if age > self._ttl_seconds and (
+                    failed_at is None or time.monotonic() - failed_at >= REFRESH_RETRY_SECONDS
+                ):
+                    self._start_load(key, current_creds, awaited=False)
+                return entry
+            del self._cache[key]
+
+        # Shield so one caller being cancelled does not cancel the fetch for the others
+        return await asyncio.shield(self._start_load(key, current_creds))
+
+    async def prefetch(self, league_id: int, year: int) -> None:
+        """Warm the cache for a league; failures are logged, not raised."""
+        try:
+            await self.get_cached_league(league_id, year)
+        except Exception as e:
+            log_error(f"Prefetch of league {league_id}, year {year} failed: {str(e)}")
+
+    def invalidate(self, league_id: int | None = None, year: int | None = None) -> int:
+        """Drop cached leagues matching league_id/year (all when both are None), in memory and
+        on disk; returns the number of distinct leagues cleared."""
+        keys = [
+            key
+            for key in self._cache
+            if (league_id is None or key[0] == league_id) and (year is None or key[1] == year)
+        ]
+        for key in keys:
+            del self._cache[key]
+        self._generation += 1
+        return len(set(keys) | _remove_disk_cache(league_id, year))
+
+    def _start_load(
+        self, key: Tuple[int, int], creds: Tuple[str, str], awaited: bool = True
+    ) -> asyncio.Future[CachedLeague]:
+        inflight_key = (key, creds, self._generation)
+        if awaited:
+            self._awaited.add(inflight_key)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, creds, self._generation))
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda t: self._load_done(inflight_key, t))
+        return task
+
+    def _load_done(self, inflight_key, task: asyncio.Future[CachedLeague]) -> None:
+        self._inflight.pop(inflight_key, None)
+        awaited = inflight_key in self._awaited
+        self._awaited.discard(inflight_key)
+        if task.cancelled() or task.exception() is None:
+            return
+        # A stale entry stays cached; back off so every request doesn't retry a failing ESPN
+        key, _, generation = inflight_key
+        entry = self._cache.get(key)
+        if entry is not None and generation == self._generation:
+            entry.refresh_failed_at = time.monotonic()
+        # Background refreshes have no awaiter to report the failure, so log it here
+        if not awaited:
+            league_id, year = key
+            log_error(f"Refreshing league {league_id}, year {year} failed: {str(task.exception())}")
+
+    async def _load(self, key: Tuple[int, int], creds: Tuple[str, str], generation: int) -> CachedLeague:
+        league_id, year = key
+        espn_s2, swid = creds
+        log_error(f"Creating new league instance for {league_id}, year {year}")
+
+        def is_current() -> bool:
+            return self._last_creds == creds and self._generation == generation
+
+        # League() fetches several ESPN views synchronously; keep that off the event loop
+        entry = await asyncio.to_thread(_fetch_league, league_id, year, espn_s2, swid, is_current)
+        # Credentials may have changed or the cache been cleared while fetching; don't repopulate it
+        if is_current():
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        # Expired entries are otherwise only dropped when requested again; sweep them on each
+        # insert (the cache is at most max_leagues long), then trim to the LRU bound.
+        now = time.monotonic()
+        expired = [key for key, entry in self._cache.items() if now - entry.created_at > self._hard_ttl_seconds]
+        for key in expired:
+            del self._cache[key]
+        while len(self._cache) > self._max_leagues:
+            self._cache.popitem(last=False)
 
 
 # -----------------------------
@@ -75,16 +447,28 @@ def mask_secret(value: Optional[str], show_last: int = 4) -> str:
     return ("*" * (len(value) - show_last)) + value[-show_last:]
 
 
+@lru_cache(maxsize=1)
+def _env_credentials() -> Tuple[Optional[str], Optional[str]]:
+    # Cached because every tool call reads credentials; cleared whenever we write os.environ
+    espn_s2 = os.environ.get("ESPN_S2") or os.environ.get("espn_s2")
+    swid = os.environ.get("SWID") or os.environ.get("swid")
+    return espn_s2, swid
+
+
 class CredentialManager:
     """Manages ESPN credentials from process env and optional .env persistence."""
 
     def __init__(self) -> None:
         self._memory: dict[str, Optional[str]] = {"espn_s2": None, "SWID": None}
+        # Parsed .env kept between writes: lines, plus key -> line index
+        self._dotenv_path: Optional[str] = None
+        self._dotenv_mtime: Optional[float] = None
+        self._dotenv_lines: Optional[list[str]] = None
+        self._dotenv_index: dict[str, int] = {}
 
     def get(self) -> Tuple[Optional[str], Optional[str], 'AuthState']:
         # Read from process environment with support for common aliases
-        env_espn_s2 = os.environ.get("ESPN_S2") or os.environ.get("espn_s2")
-        env_swid = os.environ.get("SWID") or os.environ.get("swid")
+        env_espn_s2, env_swid = _env_credentials()
 
         # Memory takes precedence only if explicitly set for current run
         espn_s2 = self._memory.get("ESPN_S2") or env_espn_s2
@@ -121,95 +505,249 @@ class CredentialManager:
                 os.environ["SWID"] = swid
             except Exception:
                 pass
+            _env_credentials.cache_clear()
 
         if persist_mode == "dot_env":
             self._write_dotenv(espn_s2, swid)
 
-    def _write_dotenv(self, espn_s2: str, swid: str) -> None:
-        path = os.path.join(os.getcwd(), ".env")
+    def _load_dotenv_lines(self, path: str) -> list[str]:
+        # Reuse the parsed file unless it was edited on disk since we last read or wrote it
+        try:
+            mtime: Optional[float] = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        if self._dotenv_lines is not None and self._dotenv_path == path and self._dotenv_mtime == mtime:
+            return self._dotenv_lines
+
         lines: list[str] = []
         try:
-            if os.path.exists(path):
+            if mtime is not None:
                 with open(path, "r", encoding="utf-8") as f:
                     lines = f.read().splitlines()
         except Exception:
             lines = []
+        self._dotenv_path = path
+        self._dotenv_lines = lines
+        # Later duplicates win when dotenv loads the file, so index the last occurrence
+        self._dotenv_index = {}
+        for i, line in enumerate(lines):
+            key, sep, _ = line.partition("=")
+            if sep:
+                self._dotenv_index[key] = i
+        return lines
 
-        def upsert(lines: list[str], key: str, value: str) -> list[str]:
-            found = False
-            new_lines = []
-            for line in lines:
-                if line.startswith(f"{key}="):
-                    new_lines.append(f"{key}={value}")
-                    found = True
-                else:
-                    new_lines.append(line)
-            if not found:
-                new_lines.append(f"{key}={value}")
-            return new_lines
-
-        lines = upsert(lines, "espn_s2", espn_s2)
-        lines = upsert(lines, "SWID", swid)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines) + "\n")
+    def _write_dotenv(self, espn_s2: str, swid: str) -> None:
+        # Follow a symlinked .env so the link target is updated rather than replaced
+        path = os.path.realpath(os.path.join(os.getcwd(), ".env"))
+        lines = self._load_dotenv_lines(path)
+        for key, value in (("espn_s2", espn_s2), ("SWID", swid)):
+            line = f"{key}={value}"
+            index = self._dotenv_index.get(key)
+            if index is None:
+                self._dotenv_index[key] = len(lines)
+                lines.append(line)
+            else:
+                lines[index] = line
+
+        # Write to a private temp file and swap it in so a crash never leaves a truncated .env;
+        # mkstemp creates it 0600 under a unique name, and an existing file's mode is kept
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".env.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            if os.path.exists(path):
+                shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._dotenv_mtime = os.stat(path).st_mtime
 
 
-_auth_lock = asyncio.Lock()
-_credential_manager = CredentialManager()
+class BrowserPool:
+    """Keeps a single Chromium instance alive so each login only opens a new context."""
 
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._headless: Optional[bool] = None
 
-async def authenticate_browser(timeout_seconds: int = 180, headless: bool = False) -> Tuple[str, str]:
-    try:
+    async def get_browser(self, headless: bool):
         from playwright.async_api import async_playwright
+
+        async with self._lock:
+            if self._browser is not None and (self._headless != headless or not self._browser.is_connected()):
+                await self._close()
+            if self._browser is None:
+                self._playwright = await async_playwright().start()
+                try:
+                    self._browser = await self._playwright.chromium.launch(headless=headless)
+                except Exception:
+                    await self._close()
+                    raise
+                self._headless = headless
+            return self._browser
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._close()
+
+    async def _close(self) -> None:
+        browser, playwright = self._browser, self._playwright
+        self._browser = None
+        self._playwright = None
+        self._headless = None
+        try:
+            if browser is not None:
+                await browser.close()
+        finally:
+            if playwright is not None:
+                await playwright.stop()
+
+
+# Cookie names as ESPN may send them -> the credential they populate
+_AUTH_COOKIE_NAMES = {"espn_s2": "espn_s2", "ESPN_S2": "espn_s2", "SWID": "SWID", "swid": "SWID"}
+
+_auth_lock = asyncio.Lock()
+_credential_manager = CredentialManager()
+_browser_pool = BrowserPool()
+_league_service = LeagueService()
+
+
+# Process-wide resources; FastMCP enters the lifespan once per client session over SSE and
+# streamable HTTP, so these are set up by the first session and shared by the rest.
+_resources_loop: Optional[asyncio.AbstractEventLoop] = None
+_prefetch_task: Optional[asyncio.Task] = None
+_active_sessions = 0
+
+
+def _setup_process_resources() -> None:
+    global _resources_loop, _prefetch_task
+    loop = asyncio.get_running_loop()
+    if _resources_loop is loop:
+        return
+    _resources_loop = loop
+    # Tool calls run espn_api's blocking HTTP in asyncio.to_thread; the default executor can be
+    # as small as cpu_count + 4 workers, which serializes concurrent fetches on small hosts.
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=ESPN_WORKER_THREADS, thread_name_prefix="espn"))
+    _prefetch_task = _start_default_league_prefetch()
+
+
+@asynccontextmanager
+async def server_lifespan(_server):
+    """FastMCP lifespan: set up the ESPN thread pool and league prefetch on the first session,
+    and close the shared browser once the last session ends.
+
+    The executor is shared for the life of the process. The browser is reopened lazily if a
+    later session needs to log in again.
+    """
+    global _active_sessions
+    _setup_process_resources()
+    _active_sessions += 1
+    try:
+        yield
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            # Logins run under _auth_lock, so taking it waits out one that is still in progress
+            async with _auth_lock:
+                if _active_sessions == 0:
+                    await _browser_pool.close()
+
+
+def _start_default_league_prefetch() -> Optional[asyncio.Task]:
+    # Warm the cache for ESPN_LEAGUE_ID so the first tool call doesn't wait on ESPN. Skipped
+    # without stored credentials, since fetching would otherwise open a browser login at startup.
+    raw = os.environ.get("ESPN_LEAGUE_ID")
+    if not raw:
+        return None
+    try:
+        league_id = int(raw)
+    except ValueError:
+        log_error(f"Ignoring invalid ESPN_LEAGUE_ID={raw!r}")
+        return None
+    _, _, state = _credential_manager.get()
+    if not state.is_valid:
+        return None
+    return asyncio.create_task(_league_service.prefetch(league_id, current_season()))
+
+
+async def _login_via_browser(timeout_seconds: int, headless: bool) -> Tuple[str, str]:
+    # Callers must hold _auth_lock
+    try:
+        import playwright.async_api  # noqa: F401
     except Exception as import_err:
         log_error(f"Playwright import failed: {str(import_err)}")
         raise RuntimeError(
             "Playwright is required for browser authentication. Install browsers with: python -m playwright install chromium"
         )
 
-    async with _auth_lock:
-        async with async_playwright() as p:
-            try:
-                browser = await p.chromium.launch(headless=headless)
-            except Exception as launch_err:
-                msg = (
-                    "Failed to launch Chromium. You may need to install Playwright browsers. "
-                    "Run: python -m playwright install chromium"
-                )
-                log_error(f"{msg} | Details: {str(launch_err)}")
-                raise RuntimeError(msg)
-
-            context = await browser.new_context()
-            page = await context.new_page()
-            await page.goto("https://www.espn.com/fantasy/football/")
-
-            loop = asyncio.get_event_loop()
-            deadline = loop.time() + timeout_seconds
-            found_espn_s2 = None
-            found_swid = None
-
-            log_error("Please log into ESPN in the opened browser window...")
+    try:
+        browser = await _browser_pool.get_browser(headless)
+    except Exception as launch_err:
+        msg = (
+            "Failed to launch Chromium. You may need to install Playwright browsers. "
+            "Run: python -m playwright install chromium"
+        )
+        log_error(f"{msg} | Details: {str(launch_err)}")
+        raise RuntimeError(msg)
+
+    context = await browser.new_context()
+    try:
+        # Login cookies arrive on ESPN responses; wake the cookie check on those
+        # instead of polling the browser continuously.
+        espn_activity = asyncio.Event()
+
+        def on_response(response) -> None:
+            if "espn.com" in response.url:
+                espn_activity.set()
+
+        context.on("response", on_response)
+        page = await context.new_page()
+        await page.goto("https://www.espn.com/fantasy/football/")
+
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout_seconds
+        found: dict[str, str] = {}
+
+        log_error("Please log into ESPN in the opened browser window...")
+        while True:
+            espn_activity.clear()
+            cookies = await context.cookies()
+            for cookie in cookies:
+                target = _AUTH_COOKIE_NAMES.get(cookie.get("name"))
+                if target and target not in found and cookie.get("value"):
+                    found[target] = cookie["value"]
+            if len(found) == 2:
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            # Fall back to a slow poll in case cookies are set without a response event
             try:
-                while loop.time() < deadline:
-                    cookies = await context.cookies()
-                    for cookie in cookies:
-                        name = cookie.get("name")
-                        if name == "espn_s2" and not found_espn_s2:
-                            found_espn_s2 = cookie.get("value")
-                        if name == "SWID" and not found_swid:
-                            found_swid = cookie.get("value")
-                    if found_espn_s2 and found_swid:
-                        break
-                    await asyncio.sleep(0.5)
-            finally:
-                await browser.close()
+                await asyncio.wait_for(espn_activity.wait(), timeout=min(remaining, 5.0))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await context.close()
+
+    found_espn_s2 = found.get("espn_s2")
+    found_swid = found.get("SWID")
+    if not (found_espn_s2 and found_swid):
+        raise TimeoutError(
+            "Timed out waiting for login. Please log into ESPN in the opened browser window, then retry."
+        )
 
-            if not (found_espn_s2 and found_swid):
-                raise TimeoutError(
-                    "Timed out waiting for login. Please log into ESPN in the opened browser window, then retry."
-                )
+    return found_espn_s2, found_swid
 
-            return found_espn_s2, found_swid
+
+async def authenticate_browser(timeout_seconds: int = 180, headless: bool = False) -> Tuple[str, str]:
+    async with _auth_lock:
+        return await _login_via_browser(timeout_seconds, headless)
 
 
 async def ensure_authenticated(headless: bool = False, persist_mode: Literal["memory", "env", "dot_env"] = "env") -> Tuple[str, str, 'AuthState']:
@@ -217,9 +755,16 @@ async def ensure_authenticated(headless: bool = False, persist_mode: Literal["me
     if state.is_valid:
         return espn_s2 or "", swid or "", state
 
-    # Acquire via browser
-    new_espn_s2, new_swid = await authenticate_browser(headless=headless)
-    _credential_manager.set(new_espn_s2, new_swid, persist_mode=persist_mode)
+    async with _auth_lock:
+        # A login may have completed while we waited for the lock; reuse it rather than
+        # opening another browser window
+        espn_s2, swid, state = _credential_manager.get()
+        if state.is_valid:
+            return espn_s2 or "", swid or "", state
+
+        # Acquire via browser
+        new_espn_s2, new_swid = await _login_via_browser(timeout_seconds=180, headless=headless)
+        _credential_manager.set(new_espn_s2, new_swid, persist_mode=persist_mode)
     espn_s2, swid, state = _credential_manager.get()
     return espn_s2 or "", swid or "", state
 
@@ -227,3 +772,6 @@ async def ensure_authenticated(headless: bool = False, persist_mode: Literal["me
 def get_credential_manager() -> 'CredentialManager':
     return _credential_manager
 
+
+def get_league_service() -> LeagueService:
+    return _league_service
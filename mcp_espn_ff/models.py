@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+# Tool response shapes. Field names are the JSON keys clients see; orjson encodes
+# these dataclasses natively, so no intermediate dicts are built.
+
+
+@dataclass(slots=True)
+class LeagueInfo:
+    name: str
+    year: int
+    current_week: int
+    nfl_week: int
+    team_count: int
+    teams: list[str]
+    scoring_type: str
+
+
+@dataclass(slots=True)
+class RosterColumns:
+    """One list per field; index i across the lists describes the i-th rostered player."""
+
+    name: list[str]
+    position: list[str]
+    proTeam: list[str]
+    points: list[float]
+    projected_points: list[float]
+    stats: list[dict]
+
+
+@dataclass(slots=True)
+class TeamRoster:
+    team_name: str
+    owner: Any
+    wins: int
+    losses: int
+    roster: RosterColumns
+
+
+@dataclass(slots=True)
+class TeamInfo:
+    team_name: str
+    owner: Any
+    wins: int
+    losses: int
+    ties: int
+    points_for: float
+    points_against: float
+    acquisitions: int
+    drops: int
+    trades: int
+    playoff_pct: float
+    final_standing: int
+    outcomes: list[str]
+
+
+@dataclass(slots=True)
+class PlayerStats:
+    name: str
+    position: str
+    team: str
+    points: float
+    projected_points: float
+    stats: dict
+    injured: bool
+
+
+@dataclass(slots=True)
+class StandingsRow:
+    rank: int
+    team_name: str
+    owner: Any
+    wins: int
+    losses: int
+    points_for: float
+    points_against: float
+
+
+@dataclass(slots=True)
+class MatchupRow:
+    home_team: str
+    home_score: float
+    away_team: str
+    away_score: float
+    winner: str
@@ -1,20 +1,178 @@
 import sys
-import datetime
+import asyncio
+import functools
+from functools import singledispatch
+import orjson
+from espn_api.requests.espn_requests import ESPNAccessDenied
 from mcp.server.fastmcp import FastMCP
-from .espn_service import LeagueService, ensure_authenticated
+from .espn_service import CachedLeague, current_season, ensure_authenticated, get_league_service
+from .models import LeagueInfo, MatchupRow, PlayerStats, RosterColumns, StandingsRow, TeamInfo, TeamRoster
 
 
 def log_error(message: str) -> None:
     print(message, file=sys.stderr)
 
 
-CURRENT_YEAR = datetime.datetime.now().year
-if datetime.datetime.now().month < 7:
-    CURRENT_YEAR -= 1
+PRIVATE_LEAGUE_MSG = (
+    "This appears to be a private league. Run the authenticate tool to login via browser.\n"
+    "After login, credentials (ESPN_S2 and SWID) will be displayed so you can update your connector env or .env."
+)
+
+
+@singledispatch
+def _is_auth_error(exc: Exception, message: str) -> bool:
+    # Fallback for errors without a registered type: look for auth hints in the message
+    return "401" in message or "Private" in message
+
+
+@_is_auth_error.register
+def _(exc: ESPNAccessDenied, message: str) -> bool:
+    return True
+
+
+def tool_handler(label: str):
+    """Turn a tool's exceptions into user-facing messages instead of MCP errors."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                # Format once: espn-api errors can carry long response text
+                message = f"Error retrieving {label}: {str(e)}"
+                log_error(message)
+                if _is_auth_error(e, message):
+                    return PRIVATE_LEAGUE_MSG
+                return message
+
+        return wrapper
+
+    return decorator
+
+
+def _json_default(obj: object) -> object:
+    # orjson only calls this for types it cannot encode natively
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    return str(obj)
+
+
+def _to_json(data: object) -> str:
+    return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _roster_columns(roster) -> RosterColumns:
+    names, positions, pro_teams, points, projected, stats = [], [], [], [], [], []
+    for p in roster:
+        names.append(p.name)
+        positions.append(p.position)
+        pro_teams.append(p.proTeam)
+        points.append(p.total_points)
+        projected.append(p.projected_total_points)
+        stats.append(p.stats)
+    return RosterColumns(
+        name=names,
+        position=positions,
+        proTeam=pro_teams,
+        points=points,
+        projected_points=projected,
+        stats=stats,
+    )
+
+
+# Indexed by (home < away) - (home > away): 0 -> tie, 1 -> away ahead, -1 -> home ahead
+_MATCHUP_WINNER = ("TIE", "AWAY", "HOME")
+
+
+def _matchup_row(matchup) -> MatchupRow:
+    home_score = matchup.home_score
+    away_score = matchup.away_score
+    away_team = matchup.away_team
+    return MatchupRow(
+        home_team=matchup.home_team.team_name,
+        home_score=home_score,
+        away_team=away_team.team_name if away_team else "BYE",
+        away_score=away_score if away_team else 0,
+        winner=_MATCHUP_WINNER[(home_score < away_score) - (home_score > away_score)],
+    )
+
+
+def _league_info_json(cached: CachedLeague) -> str:
+    league = cached.league
+    info = LeagueInfo(
+        name=league.settings.name,
+        year=league.year,
+        current_week=league.current_week,
+        nfl_week=league.nfl_week,
+        team_count=cached.team_count,
+        teams=[team.team_name for team in league.teams],
+        scoring_type=league.settings.scoring_type,
+    )
+    return _to_json(info)
+
+
+def _team_roster_json(team) -> str:
+    roster_info = TeamRoster(
+        team_name=team.team_name,
+        owner=team.owners,
+        wins=team.wins,
+        losses=team.losses,
+        roster=_roster_columns(team.roster),
+    )
+    return _to_json(roster_info)
+
+
+def _team_info_json(team) -> str:
+    team_info = TeamInfo(
+        team_name=team.team_name,
+        owner=team.owners,
+        wins=team.wins,
+        losses=team.losses,
+        ties=team.ties,
+        points_for=team.points_for,
+        points_against=team.points_against,
+        acquisitions=team.acquisitions,
+        drops=team.drops,
+        trades=team.trades,
+        playoff_pct=team.playoff_pct,
+        final_standing=team.final_standing,
+        outcomes=team.outcomes,
+    )
+    return _to_json(team_info)
+
+
+def _player_stats_json(player) -> str:
+    stats = PlayerStats(
+        name=player.name,
+        position=player.position,
+        team=player.proTeam,
+        points=player.total_points,
+        projected_points=player.projected_total_points,
+        stats=player.stats,
+        injured=player.injured,
+    )
+    return _to_json(stats)
+
+
+def _standings_json(sorted_teams) -> str:
+    standings = [
+        StandingsRow(
+            rank=i + 1,
+            team_name=team.team_name,
+            owner=team.owners,
+            wins=team.wins,
+            losses=team.losses,
+            points_for=team.points_for,
+            points_against=team.points_against,
+        )
+        for i, team in enumerate(sorted_teams)
+    ]
+    return _to_json(standings)
 
 
 def create_tools(mcp: FastMCP) -> None:
-    league_service = LeagueService()
+    league_service = get_league_service()
 
     @mcp.tool(name="authenticate", description="Only needed if credentials are not present or not valid in process environment.")
     async def authenticate() -> str:
@@ -27,187 +185,78 @@ def create_tools(mcp: FastMCP) -> None:
                 "These values are applied to this session. Copy them into your connector's env or a local .env."
             )
         except Exception as e:
-            log_error(f"Authentication error: {str(e)}")
-            return f"Authentication error: {str(e)}"
+            message = f"Authentication error: {str(e)}"
+            log_error(message)
+            return message
+
+    @mcp.tool(description="Drop cached league data so the next call refetches it from ESPN. Omit league_id and year to clear everything.")
+    async def clear_league_cache(league_id: int | None = None, year: int | None = None) -> str:
+        removed = league_service.invalidate(league_id, year)
+        return f"Cleared {removed} cached league(s)."
 
     @mcp.tool()
-    async def get_league_info(league_id: int, year: int = CURRENT_YEAR) -> str:
-        try:
-            league = await league_service.get_league(league_id, year)
-            info = {
-                "name": league.settings.name,
-                "year": league.year,
-                "current_week": league.current_week,
-                "nfl_week": league.nfl_week,
-                "team_count": len(league.teams),
-                "teams": [team.team_name for team in league.teams],
-                "scoring_type": league.settings.scoring_type,
-            }
-            return str(info)
-        except Exception as e:
-            log_error(f"Error retrieving league info: {str(e)}")
-            if "401" in str(e) or "Private" in str(e):
-                return (
-                    "This appears to be a private league. Run the authenticate tool to login via browser.\n"
-                    "After login, credentials (ESPN_S2 and SWID) will be displayed so you can update your connector env or .env."
-                )
-            return f"Error retrieving league: {str(e)}"
+    @tool_handler("league info")
+    async def get_league_info(league_id: int, year: int | None = None) -> str:
+        if year is None:
+            year = current_season()
+        cached = await league_service.get_cached_league(league_id, year)
+        return cached.memoize(("league_info",), lambda: _league_info_json(cached))
 
     @mcp.tool()
-    async def get_team_roster(league_id: int, team_id: int, year: int = CURRENT_YEAR) -> str:
-        try:
-            league = await league_service.get_league(league_id, year)
-            if team_id < 1 or team_id > len(league.teams):
-                return f"Invalid team_id. Must be between 1 and {len(league.teams)}"
-            team = league.teams[team_id - 1]
-            roster_info = {
-                "team_name": team.team_name,
-                "owner": team.owners,
-                "wins": team.wins,
-                "losses": team.losses,
-                "roster": [
-                    {
-                        "name": p.name,
-                        "position": p.position,
-                        "proTeam": p.proTeam,
-                        "points": p.total_points,
-                        "projected_points": p.projected_total_points,
-                        "stats": p.stats,
-                    }
-                    for p in team.roster
-                ],
-            }
-            return str(roster_info)
-        except Exception as e:
-            log_error(f"Error retrieving team roster: {str(e)}")
-            if "401" in str(e) or "Private" in str(e):
-                return (
-                    "This appears to be a private league. Run the authenticate tool to login via browser.\n"
-                    "After login, credentials (ESPN_S2 and SWID) will be displayed so you can update your connector env or .env."
-                )
-            return f"Error retrieving team roster: {str(e)}"
+    @tool_handler("team roster")
+    async def get_team_roster(league_id: int, team_id: int, year: int | None = None) -> str:
+        if year is None:
+            year = current_season()
+        cached = await league_service.get_cached_league(league_id, year)
+        team_count = cached.team_count
+        if not 1 <= team_id <= team_count:
+            return f"Invalid team_id. Must be between 1 and {team_count}"
+        team = cached.league.teams[team_id - 1]
+        return cached.memoize(("team_roster", team_id), lambda: _team_roster_json(team))
 
     @mcp.tool()
-    async def get_team_info(league_id: int, team_id: int, year: int = CURRENT_YEAR) -> str:
-        try:
-            league = await league_service.get_league(league_id, year)
-            if team_id < 1 or team_id > len(league.teams):
-                return f"Invalid team_id. Must be between 1 and {len(league.teams)}"
-            team = league.teams[team_id - 1]
-            team_info = {
-                "team_name": team.team_name,
-                "owner": team.owners,
-                "wins": team.wins,
-                "losses": team.losses,
-                "ties": team.ties,
-                "points_for": team.points_for,
-                "points_against": team.points_against,
-                "acquisitions": team.acquisitions,
-                "drops": team.drops,
-                "trades": team.trades,
-                "playoff_pct": team.playoff_pct,
-                "final_standing": team.final_standing,
-                "outcomes": team.outcomes,
-            }
-            return str(team_info)
-        except Exception as e:
-            log_error(f"Error retrieving team results: {str(e)}")
-            if "401" in str(e) or "Private" in str(e):
-                return (
-                    "This appears to be a private league. Run the authenticate tool to login via browser.\n"
-                    "After login, credentials (ESPN_S2 and SWID) will be displayed so you can update your connector env or .env."
-                )
-            return f"Error retrieving team results: {str(e)}"
+    @tool_handler("team results")
+    async def get_team_info(league_id: int, team_id: int, year: int | None = None) -> str:
+        if year is None:
+            year = current_season()
+        cached = await league_service.get_cached_league(league_id, year)
+        team_count = cached.team_count
+        if not 1 <= team_id <= team_count:
+            return f"Invalid team_id. Must be between 1 and {team_count}"
+        team = cached.league.teams[team_id - 1]
+        return cached.memoize(("team_info", team_id), lambda: _team_info_json(team))
 
     @mcp.tool()
-    async def get_player_stats(league_id: int, player_name: str, year: int = CURRENT_YEAR) -> str:
-        try:
-            league = await league_service.get_league(league_id, year)
-            player = None
-            for team in league.teams:
-                for roster_player in team.roster:
-                    if player_name.lower() in roster_player.name.lower():
-                        player = roster_player
-                        break
-                if player:
-                    break
-            if not player:
-                return f"Player '{player_name}' not found in league {league_id}"
-            stats = {
-                "name": player.name,
-                "position": player.position,
-                "team": player.proTeam,
-                "points": player.total_points,
-                "projected_points": player.projected_total_points,
-                "stats": player.stats,
-                "injured": player.injured,
-            }
-            return str(stats)
-        except Exception as e:
-            log_error(f"Error retrieving player stats: {str(e)}")
-            if "401" in str(e) or "Private" in str(e):
-                return (
-                    "This appears to be a private league. Run the authenticate tool to login via browser.\n"
-                    "After login, credentials (ESPN_S2 and SWID) will be displayed so you can update your connector env or .env."
-                )
-            return f"Error retrieving player stats: {str(e)}"
+    @tool_handler("player stats")
+    async def get_player_stats(league_id: int, player_name: str, year: int | None = None) -> str:
+        if year is None:
+            year = current_season()
+        cached = await league_service.get_cached_league(league_id, year)
+        player = cached.find_player(player_name)
+        if not player:
+            return f"Player '{player_name}' not found in league {league_id}"
+        return cached.memoize(("player_stats", player.playerId), lambda: _player_stats_json(player))
 
     @mcp.tool()
-    async def get_league_standings(league_id: int, year: int = CURRENT_YEAR) -> str:
-        try:
-            league = await league_service.get_league(league_id, year)
-            sorted_teams = sorted(league.teams, key=lambda x: (x.wins, x.points_for), reverse=True)
-            standings = []
-            for i, team in enumerate(sorted_teams):
-                standings.append(
-                    {
-                        "rank": i + 1,
-                        "team_name": team.team_name,
-                        "owner": team.owners,
-                        "wins": team.wins,
-                        "losses": team.losses,
-                        "points_for": team.points_for,
-                        "points_against": team.points_against,
-                    }
-                )
-            return str(standings)
-        except Exception as e:
-            log_error(f"Error retrieving league standings: {str(e)}")
-            if "401" in str(e) or "Private" in str(e):
-                return (
-                    "This appears to be a private league. Run the authenticate tool to login via browser.\n"
-                    "After login, credentials (ESPN_S2 and SWID) will be displayed so you can update your connector env or .env."
-                )
-            return f"Error retrieving league standings: {str(e)}"
+    @tool_handler("league standings")
+    async def get_league_standings(league_id: int, year: int | None = None) -> str:
+        if year is None:
+            year = current_season()
+        cached = await league_service.get_cached_league(league_id, year)
+        return cached.memoize(("league_standings",), lambda: _standings_json(cached.standings()))
 
     @mcp.tool()
-    async def get_matchup_info(league_id: int, week: int | None = None, year: int = CURRENT_YEAR) -> str:
-        try:
-            league = await league_service.get_league(league_id, year)
-            if week is None:
-                week = league.current_week
-            if week < 1 or week > 17:
-                return "Invalid week number. Must be between 1 and 17"
-            matchups = league.box_scores(week)
-            matchup_info = []
-            for matchup in matchups:
-                matchup_info.append(
-                    {
-                        "home_team": matchup.home_team.team_name,
-                        "home_score": matchup.home_score,
-                        "away_team": matchup.away_team.team_name if matchup.away_team else "BYE",
-                        "away_score": matchup.away_score if matchup.away_team else 0,
-                        "winner": "HOME" if matchup.home_score > matchup.away_score else "AWAY" if matchup.away_score > matchup.home_score else "TIE",
-                    }
-                )
-            return str(matchup_info)
-        except Exception as e:
-            log_error(f"Error retrieving matchup information: {str(e)}")
-            if "401" in str(e) or "Private" in str(e):
-                return (
-                    "This appears to be a private league. Run the authenticate tool to login via browser.\n"
-                    "After login, credentials (ESPN_S2 and SWID) will be displayed so you can update your connector env or .env."
-                )
-            return f"Error retrieving matchup information: {str(e)}"
+    @tool_handler("matchup information")
+    async def get_matchup_info(league_id: int, week: int | None = None, year: int | None = None) -> str:
+        if year is None:
+            year = current_season()
+        league = await league_service.get_league(league_id, year)
+        if week is None:
+            week = league.current_week
+        if week < 1 or week > 17:
+            return "Invalid week number. Must be between 1 and 17"
+        matchups = await asyncio.to_thread(league.box_scores, week)
+        matchup_info = [_matchup_row(matchup) for matchup in matchups]
+        return _to_json(matchup_info)
 
 
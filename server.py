@@ -1,5 +1,6 @@
 import sys
 from mcp.server.fastmcp import FastMCP
+from mcp_espn_ff.espn_service import env_flag, server_lifespan
 from mcp_espn_ff.tools import create_tools
 
 
@@ -9,7 +10,11 @@ def log_error(message: str) -> None:
 
 def main() -> None:
     log_error("Initializing FastMCP server...")
-    mcp = FastMCP("espn-fantasy-football", dependancies=["espn-api", "playwright"])
+    mcp = FastMCP(
+        "espn-fantasy-football",
+        dependencies=["espn-api", "playwright"],
+        lifespan=server_lifespan,
+    )
     create_tools(mcp)
     log_error("Starting MCP server...")
     mcp.run()
@@ -22,9 +27,15 @@ if __name__ == "__main__":
         log_error(f"ERROR DURING SERVER INITIALIZATION: {str(e)}")
         import traceback
         traceback.print_exc(file=sys.stderr)
-        log_error("Server failed to start, but kept running for logging. Press Ctrl+C to exit.")
-        import time
-        while True:
-            time.sleep(10)
+        if env_flag("MCP_HOLD_ON_ERROR"):
+            log_error("Server failed to start, but kept running for logging. Press Ctrl+C to exit.")
+            import signal
+            if hasattr(signal, "pause"):
+                signal.pause()
+            else:
+                import time
+                while True:
+                    time.sleep(3600)
+        sys.exit(1)
 
 